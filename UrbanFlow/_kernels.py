@@ -0,0 +1,169 @@
+"""
+Numeric kernels used by CityDataSet.
+
+The kernels are compiled with Numba when it is installed. Without Numba the
+same functions fall back to equivalent (multi-pass) NumPy code.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import get_num_threads, njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+if HAVE_NUMBA:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _mean_kernel(values):
+        """Sum values in parallel and divide by their count."""
+        total = 0.0
+        for i in prange(values.size):
+            total += values[i]
+        return total / values.size
+
+    @njit(parallel=True, cache=True)
+    def _hotspots_kernel(traffic, pm25, threshold, out_mask):
+        """
+        Flag records whose pollution-to-traffic ratio exceeds threshold.
+
+        Divides in float64 like CityRecord.compute_pollution_to_traffic_ratio,
+        so a ratio equal to threshold is not flagged. Records with zero traffic
+        or zero PM2.5 are never flagged.
+        """
+        for i in prange(traffic.size):
+            # 'and' short-circuits, so there is no division by zero traffic
+            out_mask[i] = traffic[i] > 0 and pm25[i] > 0 and pm25[i] / traffic[i] > threshold
+
+    @njit(parallel=True, cache=True)
+    def _summary_kernel(year, first_year, traffic, pm25, threshold,
+                        sum_t, sum_p, cnt, hotspot_mask, n_chunks):
+        """
+        Compute everything export_summary needs in a single pass over the columns.
+
+        Fills per-year traffic and PM2.5 sums and record counts (slot k holds
+        year first_year + k; records whose year falls outside the slots, e.g.
+        year 0 for unknown dates, are left out of the yearly sums), flags
+        hotspots the same way as _hotspots_kernel, and returns the overall
+        traffic and PM2.5 totals. The records are split into n_chunks blocks,
+        each filling its own partial sums, which are reduced at the end.
+        """
+        n = year.size
+        n_years = cnt.size
+        chunk = (n + n_chunks - 1) // n_chunks
+        part_t = np.zeros((n_chunks, n_years))
+        part_p = np.zeros((n_chunks, n_years))
+        part_c = np.zeros((n_chunks, n_years), np.int64)
+        total_t = np.zeros(n_chunks)
+        total_p = np.zeros(n_chunks)
+        for c in prange(n_chunks):
+            for i in range(c * chunk, min(n, (c + 1) * chunk)):
+                t = traffic[i]
+                p = pm25[i]
+                total_t[c] += t
+                total_p[c] += p
+                hotspot_mask[i] = t > 0 and p > 0 and p / t > threshold
+                k = year[i] - first_year
+                if 0 <= k < n_years:
+                    part_t[c, k] += t
+                    part_p[c, k] += p
+                    part_c[c, k] += 1
+        for c in range(n_chunks):
+            for k in range(n_years):
+                sum_t[k] += part_t[c, k]
+                sum_p[k] += part_p[c, k]
+                cnt[k] += part_c[c, k]
+        return total_t.sum(), total_p.sum()
+
+
+def mean(values: np.ndarray) -> float:
+    """
+    Average a non-empty numeric column.
+
+    Args:
+        values: 1-D array of numbers
+
+    Returns:
+        Mean of the values, accumulated in float64
+    """
+    if HAVE_NUMBA:
+        return float(_mean_kernel(values))
+    return float(values.mean(dtype=np.float64))
+
+
+def hotspot_mask(traffic: np.ndarray, pm25: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Flag records whose pollution-to-traffic ratio exceeds threshold.
+
+    Args:
+        traffic: Traffic volume of each record
+        pm25: PM2.5 reading of each record
+        threshold: Minimum ratio to be flagged
+
+    Returns:
+        Boolean array, False for records with zero traffic or zero PM2.5
+    """
+    if HAVE_NUMBA:
+        mask = np.empty(traffic.size, np.bool_)
+        _hotspots_kernel(traffic, pm25, threshold, mask)
+        return mask
+    nonzero = traffic > 0
+    ratios = np.divide(pm25, traffic, out=np.zeros(traffic.size), where=nonzero)
+    return nonzero & (pm25 > 0) & (ratios > threshold)
+
+
+def summary_stats(year: np.ndarray, first_year: int, n_years: int, traffic: np.ndarray,
+                  pm25: np.ndarray, threshold: float
+                  ) -> Tuple[float, float, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the overall totals, yearly sums/counts and hotspot mask for a report.
+
+    Args:
+        year: Year of each record
+        first_year: Year stored in slot 0 of the yearly arrays
+        n_years: Number of yearly slots
+        traffic: Traffic volume of each record
+        pm25: PM2.5 reading of each record
+        threshold: Hotspot ratio threshold
+
+    Returns:
+        Tuple of (total traffic, total PM2.5, yearly traffic sums, yearly PM2.5
+        sums, yearly record counts, hotspot mask)
+    """
+    if HAVE_NUMBA:
+        sum_t = np.zeros(n_years)
+        sum_p = np.zeros(n_years)
+        cnt = np.zeros(n_years, np.int64)
+        mask = np.empty(traffic.size, np.bool_)
+        total_t, total_p = _summary_kernel(year, first_year, traffic, pm25, threshold,
+                                           sum_t, sum_p, cnt, mask, get_num_threads())
+        return total_t, total_p, sum_t, sum_p, cnt, mask
+
+    k = year.astype(np.int64) - first_year
+    in_range = (k >= 0) & (k < n_years)
+    k = k[in_range]
+    sum_t = np.bincount(k, weights=traffic[in_range], minlength=n_years)
+    sum_p = np.bincount(k, weights=pm25[in_range], minlength=n_years)
+    cnt = np.bincount(k, minlength=n_years)
+    return (float(traffic.sum(dtype=np.float64)), float(pm25.sum(dtype=np.float64)),
+            sum_t, sum_p, cnt, hotspot_mask(traffic, pm25, threshold))
+
+
+def _readonly_ones(dtype) -> np.ndarray:
+    """Return a one-element read-only array, like the column views CityDataSet hands out."""
+    values = np.ones(1, dtype)
+    values.flags.writeable = False
+    return values
+
+
+if HAVE_NUMBA:
+    # Compile the kernels for the (read-only) column dtypes now so the first call
+    # isn't slowed down by JIT time
+    mean(_readonly_ones(np.int32))
+    mean(_readonly_ones(np.float64))
+    hotspot_mask(_readonly_ones(np.int32), _readonly_ones(np.float64), 0.0)
+    summary_stats(_readonly_ones(np.int16), 1, 1, _readonly_ones(np.int32), _readonly_ones(np.float64), 0.0)
@@ -39,15 +39,71 @@ class TestCityRecord(unittest.TestCase):
         self.assertFalse(d['is_poor_air'])
         self.assertAlmostEqual(d['pollution_to_traffic_ratio'], 0.05)
 
+    def test_slots(self):
+        record = CityRecord("Slot St", 100, 5.0)
+        self.assertFalse(hasattr(record, '__dict__'))
+        # Frozen slotted dataclasses raise TypeError here before Python 3.12
+        with self.assertRaises((AttributeError, TypeError)):
+            record.extra = 1
+        self.assertEqual(record.to_dict()['location'], "Slot St")
+
+    def test_frozen_and_cached(self):
+        record = CityRecord("Cache St", 100, 5.0)
+        with self.assertRaises(AttributeError):
+            record.traffic_volume = 50
+        self.assertAlmostEqual(record.compute_pollution_to_traffic_ratio(), 0.05)
+        record.to_dict()['pm25'] = 99.0
+        self.assertEqual(record.to_dict()['pm25'], 5.0)
+
+        # Equal records hash equally, whatever is in their caches
+        same = CityRecord("Cache St", 100, 5.0)
+        self.assertEqual(record, same)
+        self.assertEqual(len({record, same}), 1)
+
+
+TRAFFIC_HEADER = "Boro,Yr,M,D,Vol\n"
+AIR_HEADER = "Date,Daily Mean PM2.5 Concentration,County\n"
+
 
 class TestCityDataSet(unittest.TestCase):
+    def _load(self, traffic_rows, air_rows, traffic_header=TRAFFIC_HEADER, air_header=AIR_HEADER,
+              dataset=None):
+        """Write a traffic CSV and one air quality CSV per entry of air_rows, then load them."""
+        import os
+        import tempfile
+        if isinstance(air_rows, str):
+            air_rows = [air_rows]
+        if dataset is None:
+            dataset = CityDataSet("Test City")
+        with tempfile.TemporaryDirectory() as tmp:
+            traffic_file = os.path.join(tmp, "traffic.csv")
+            with open(traffic_file, 'w') as f:
+                f.write(traffic_header + traffic_rows)
+            air_folder = os.path.join(tmp, "air")
+            os.mkdir(air_folder)
+            for n, rows in enumerate(air_rows, start=1):
+                with open(os.path.join(air_folder, f"ad_viz_plotval_data ({n}).csv"), 'w') as f:
+                    f.write(air_header + rows)
+            dataset.load_data(traffic_file, air_folder)
+        return dataset
+
+    def _report(self, dataset):
+        """Export dataset's summary report and return its text."""
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = os.path.join(tmp, "summary.txt")
+            dataset.export_summary(output_file)
+            with open(output_file, 'r') as f:
+                return f.read()
+
     def setUp(self):
         # Create sample CityRecords
         self.record1 = CityRecord("A St", 100, 5.0, "2025-01-01")
         self.record2 = CityRecord("B St", 200, 1.0, "2025-01-02")
         self.record3 = CityRecord("C St", 0, 0.0, "2025-01-03")  # edge case
         self.dataset = CityDataSet("Test City")
-        self.dataset.records.extend([self.record1, self.record2, self.record3])
+        self.dataset.add_records([self.record1, self.record2, self.record3])
 
     def test_average_traffic(self):
         # Only records with traffic > 0 count
@@ -69,6 +125,69 @@ class TestCityDataSet(unittest.TestCase):
         # Record3 has 0 traffic/PM2.5, should be skipped
         self.assertNotIn(self.record3, hotspots)
 
+    def test_find_hotspots_excludes_ratio_equal_to_threshold(self):
+        dataset = CityDataSet("Test City")
+        records = [CityRecord("a", 100, 1.0), CityRecord("b", 10, 0.1), CityRecord("c", 300, 3.0)]
+        dataset.add_records(records)
+        for record in records:
+            self.assertEqual(record.compute_pollution_to_traffic_ratio(), 0.01)
+        self.assertEqual(dataset.find_hotspots(0.01), [])
+        self.assertEqual(dataset.find_hotspots(0.0099), records)
+
+    def test_find_hotspot_indices(self):
+        self.assertEqual(self.dataset.find_hotspot_indices(0.01).tolist(), [0])
+        self.assertEqual(self.dataset.find_hotspots(0.01), [self.record1])
+
+    def test_append_bulk_grows_columns(self):
+        self.dataset.append_bulk(["D St"], [400], [8.0], ["2024-06-30"])
+        self.dataset.append_bulk(["A St", "E St"], [300, 50], [2.0, 4.0])
+        self.assertEqual(self.dataset.traffic.tolist(), [100, 200, 0, 400, 300, 50])
+        self.assertEqual(self.dataset.year.tolist(), [2025, 2025, 2025, 2024, 0, 0])
+        self.assertEqual(self.dataset.locations, ["A St", "B St", "C St", "D St", "E St"])
+        record = self.dataset.records[3]
+        self.assertEqual(record.location, "D St")
+        self.assertEqual(record.pm25, 8.0)
+        self.assertEqual(record.date, "2024-06-30")
+        self.assertIsNone(self.dataset.records[4].date)
+
+    def test_columns_are_read_only(self):
+        with self.assertRaises(ValueError):
+            self.dataset.traffic[0] = 5000
+        self.assertEqual(self.dataset.traffic.tolist(), [100, 200, 0])
+
+    def test_append_bulk_rejects_mismatched_lengths(self):
+        dataset = CityDataSet("Test City")
+        with self.assertRaises(ValueError):
+            dataset.append_bulk(['a'], [5], [1.0, 2.0])
+        self.assertEqual(dataset.locations, [])
+        self.assertEqual(dataset.records, ())
+
+    def test_records_is_read_only(self):
+        self.assertEqual(self.dataset.records, (self.record1, self.record2, self.record3))
+        with self.assertRaises(AttributeError):
+            self.dataset.records.append(CityRecord("D St", 10, 1.0))
+
+    def test_pm25_keeps_its_decimal_value(self):
+        dataset = CityDataSet("Test City")
+        dataset.add_records([CityRecord("a", 1, 9.805, "2016-01-01")])
+        self.assertEqual(dataset.records[0].pm25, 9.805)
+        self.assertEqual(dataset.average_air_quality()['pm25'], 9.805)
+
+        content = self._report(dataset)
+        # 9.805 is stored as 9.80499..., so it rounds down like the plain float does
+        self.assertIn("Overall Average PM2.5: 9.80 ", content)
+        self.assertIn("a - Ratio: 9.805000", content)
+
+    def test_append_bulk_parses_dates(self):
+        self.dataset.add_records([CityRecord("D St", 10, 1.0, "2016-5-8")])
+        self.assertEqual(self.dataset.records[-1].date, "2016-05-08")
+        self.assertEqual(int(self.dataset.year[-1]), 2016)
+
+        # A bad date is rejected and nothing is appended
+        with self.assertRaises(ValueError):
+            self.dataset.add_records([CityRecord("E St", 10, 1.0), CityRecord("F St", 10, 1.0, "05/08/2016")])
+        self.assertEqual(len(self.dataset.records), 4)
+
     def test_export_summary_creates_file(self):
         import os
         output_file = "test_summary.txt"
@@ -84,6 +203,93 @@ class TestCityDataSet(unittest.TestCase):
         # Clean up
         os.remove(output_file)
 
+    def test_export_summary_location_stats(self):
+        self.dataset.add_records([CityRecord("A St", 1500, 20.0, "2024-01-01")])
+        content = self._report(self.dataset)
+        self.assertIn("High Traffic Locations: 1", content)
+        self.assertIn("Poor Air Quality Locations: 1", content)
+        self.assertIn("A St: Records = 2, Avg Traffic = 800.00, Avg PM2.5 = 12.50, "
+                      "High Traffic = 1, Poor Air = 1", content)
+        self.assertIn("2024: Avg Traffic = 1500.00", content)
+
+    def test_location_stats_sorted_and_unsorted_agree(self):
+        sorted_ds = CityDataSet("Test City")
+        sorted_ds.append_bulk(["A St", "A St", "B St"], [1200, 100, 300], [15.0, 5.0, 2.0])
+        unsorted_ds = CityDataSet("Test City")
+        unsorted_ds.append_bulk(["A St", "B St", "A St"], [1200, 300, 100], [15.0, 2.0, 5.0])
+
+        def location_lines(content):
+            return content.split("Location Averages:\n")[1].split("\n\n")[0]
+        self.assertEqual(location_lines(self._report(sorted_ds)), location_lines(self._report(unsorted_ds)))
+        self.assertIn("A St: Records = 2, Avg Traffic = 650.00, Avg PM2.5 = 10.00, "
+                      "High Traffic = 1, Poor Air = 1", self._report(sorted_ds))
+
+    def test_report_counts_follow_appends(self):
+        self.assertIn("High Traffic Locations: 0", self._report(self.dataset))
+
+        self.dataset.append_bulk(["D St"], [1500], [20.0])
+        content = self._report(self.dataset)
+        self.assertIn("High Traffic Locations: 1", content)
+        self.assertIn("Poor Air Quality Locations: 1", content)
+
+    def test_load_data_merges_traffic_and_air(self):
+        dataset = self._load("Bronx,2016,5,8,356\n"
+                             "Queens,2016,5,8,0\n"          # no traffic, skipped
+                             "Nassau,2016,5,8,500\n"        # not NYC, skipped
+                             "Manhattan,2016,5,9,1200\n",   # no PM2.5 match
+                             "05/08/2016,12.5,Bronx\n"
+                             "05/08/2016,7.0,Queens\n")
+        self.assertEqual(dataset.records, (CityRecord("bronx", 356, 12.5, "2016-05-08"),))
+
+        # Appending after a load reuses the loaded location ids
+        dataset.add_records([CityRecord("bronx", 10, 1.0), CityRecord("Main St", 10, 1.0)])
+        self.assertEqual(dataset.location_ids.tolist(), [0, 0, 5])
+        self.assertEqual(dataset.locations[5], "Main St")
+
+    def test_load_data_skips_only_bad_cells(self):
+        dataset = self._load("Bronx,abc,5,8,100\n"          # bad year, skipped
+                             "Bronx,2016,5,8,356\n"
+                             "Queens,2016,5,8,200\n",
+                             "05/08/2016,n/a,Queens\n"      # bad PM2.5, skipped
+                             "05/08/2016,12.5,Bronx\n")
+        self.assertEqual(dataset.records, (CityRecord("bronx", 356, 12.5, "2016-05-08"),))
+
+    def test_load_data_parses_formatted_volumes(self):
+        dataset = self._load('Bronx,2016,5,8,"1,234"\n'
+                             "Queens,2016,5,8,12.0\n",
+                             "05/08/2016,12.5,Bronx\n"
+                             "05/08/2016,7.0,Queens\n")
+        self.assertEqual(dataset.records, (CityRecord("bronx", 1234, 12.5, "2016-05-08"),
+                                           CityRecord("queens", 12, 7.0, "2016-05-08")))
+
+    def test_load_data_accepts_volume_column(self):
+        dataset = self._load("Bronx,2016,5,8,356\n", "05/08/2016,12.5,Bronx\n",
+                             traffic_header="Boro,Yr,M,D,Volume\n")   # older exports call it Volume
+        self.assertEqual(dataset.records, (CityRecord("bronx", 356, 12.5, "2016-05-08"),))
+
+    def test_load_data_skips_air_file_with_missing_column(self):
+        dataset = self._load("Bronx,2016,5,8,356\n", "05/08/2016,3.0\n",
+                             air_header="Date,Daily Mean PM2.5 Concentration\n")   # no County
+        self.assertEqual(dataset.records, ())
+
+    def test_load_data_failure_clears_dataset(self):
+        # A traffic file that can't be read replaces the old records with nothing
+        dataset = self._load("", "05/08/2016,12.5,Bronx\n", traffic_header="", dataset=self.dataset)
+        self.assertEqual(dataset.records, ())
+        self.assertEqual(dataset.locations, [])
+
+    def test_air_files_read_the_same_with_processes_and_threads(self):
+        from unittest import mock
+        from . import urbanflow
+        traffic_rows = "Bronx,2016,5,1,100\nQueens,2016,5,2,200\n"
+        air_rows = ["05/01/2016,1.5,Bronx\n", "05/02/2016,2.5,Queens\n"]
+        threaded = self._load(traffic_rows, air_rows)
+        with mock.patch.object(urbanflow, 'AIR_PROCESS_POOL_MIN_BYTES', 0):
+            multiprocess = self._load(traffic_rows, air_rows)
+
+        self.assertEqual(len(multiprocess.records), 2)
+        self.assertEqual(threaded.records, multiprocess.records)
+
 
 if __name__ == "__main__":
     unittest.main()
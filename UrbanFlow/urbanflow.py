@@ -3,50 +3,76 @@ UrbanFlow: NYC Traffic & Air Quality Analysis
 CSC-101 Project
 """
 
-from typing import List, Dict, Optional, Any
-
-
+import glob
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from operator import attrgetter
+from typing import List, Dict, Optional, Any, Tuple, ClassVar
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
+
+if __package__:
+    from . import _kernels
+else:
+    # Run as a script (python UrbanFlow/urbanflow.py): make the package importable,
+    # so _kernels keeps the module name its cached Numba kernels were compiled under
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from UrbanFlow import _kernels
+
+
+# Thresholds for high traffic and poor air quality
+_HIGH_TRAFFIC_THRESHOLD = 1000  # vehicles per hour
+_POOR_AIR_PM25_THRESHOLD = 12.0  # micrograms per cubic meter
+
+
+@dataclass(slots=True, frozen=True)
 class CityRecord:
     """
     Represents a single data record for a city location with traffic and air quality metrics.
+
+    Records are immutable (and therefore hashable), so the derived values can be
+    cached on the instance without ever going stale.
     
     Attributes:
         location: The location identifier (e.g., street name, intersection)
         traffic_volume: Number of vehicles per hour
         pm25: PM2.5 air quality reading in micrograms per cubic meter
-        date: Optional date string for the record
+        date: Optional date string (format: YYYY-MM-DD)
     """
+
+    location: str
+    traffic_volume: int
+    pm25: float
+    date: Optional[str] = None
+    # Caches for compute_pollution_to_traffic_ratio() and to_dict()
+    _ratio: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
-    # Thresholds for high traffic and poor air quality
-    HIGH_TRAFFIC_THRESHOLD: int = 1000  # vehicles per hour
-    POOR_AIR_PM25_THRESHOLD: float = 12.0  # micrograms per cubic meter
-    
-    def __init__(self, location: str, traffic_volume: int, pm25: float, 
-                 date: Optional[str] = None) -> None:
-        """
-        Initialize a CityRecord with traffic and air quality data.
-        
-        Args:
-            location: Location identifier for this record
-            traffic_volume: Traffic volume in vehicles per hour
-            pm25: PM2.5 concentration in micrograms per cubic meter
-            date: Optional date string (format: YYYY-MM-DD)
-        """
-        self.location = location
-        self.traffic_volume = traffic_volume
-        self.pm25 = pm25
-        self.date = date
+    # Thresholds for high traffic and poor air quality (the methods use the
+    # module-level constants instead, to skip the class attribute lookup)
+    HIGH_TRAFFIC_THRESHOLD: ClassVar[int] = _HIGH_TRAFFIC_THRESHOLD
+    POOR_AIR_PM25_THRESHOLD: ClassVar[float] = _POOR_AIR_PM25_THRESHOLD
     
-    def is_high_traffic(self) -> bool:
+    def is_high_traffic(self, _threshold: int = _HIGH_TRAFFIC_THRESHOLD) -> bool:
         """
         Determine if this record represents high traffic conditions.
         
         Returns:
             True if traffic volume exceeds the high traffic threshold, False otherwise
         """
-        return self.traffic_volume >= CityRecord.HIGH_TRAFFIC_THRESHOLD
+        # The threshold is bound as a default argument, so it's read as a local
+        return self.traffic_volume >= _threshold
     
-    def is_poor_air(self) -> bool:
+    def is_poor_air(self, _threshold: float = _POOR_AIR_PM25_THRESHOLD) -> bool:
         """
         Determine if this record represents poor air quality conditions.
         
@@ -55,7 +81,7 @@ class CityRecord:
         Returns:
             True if air quality is poor (PM2.5 exceeds threshold), False otherwise
         """
-        return self.pm25 >= CityRecord.POOR_AIR_PM25_THRESHOLD
+        return self.pm25 >= _threshold
     
     def compute_pollution_to_traffic_ratio(self) -> float:
         """
@@ -67,10 +93,11 @@ class CityRecord:
         Returns:
             Pollution-to-traffic ratio (float). Returns 0.0 if traffic volume is 0.
         """
-        if self.traffic_volume == 0:
-            return 0.0
-        
-        return self.pm25 / self.traffic_volume
+        if self._ratio is None:
+            # Computed once; the instance is frozen, so bypass its __setattr__
+            ratio = 0.0 if self.traffic_volume == 0 else self.pm25 / self.traffic_volume
+            object.__setattr__(self, '_ratio', ratio)
+        return self._ratio
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -79,24 +106,301 @@ class CityRecord:
         Returns:
             Dictionary containing all record attributes
         """
-        return {
-            'location': self.location,
-            'traffic_volume': self.traffic_volume,
-            'pm25': self.pm25,
-            'date': self.date,
-            'is_high_traffic': self.is_high_traffic(),
-            'is_poor_air': self.is_poor_air(),
-            'pollution_to_traffic_ratio': self.compute_pollution_to_traffic_ratio()
-        }
+        if self._dict is None:
+            # Built once and cached; derived fields are computed inline to avoid
+            # extra method calls
+            traffic_volume = self.traffic_volume
+            pm25 = self.pm25
+            object.__setattr__(self, '_dict', {
+                'location': self.location,
+                'traffic_volume': traffic_volume,
+                'pm25': pm25,
+                'date': self.date,
+                'is_high_traffic': traffic_volume >= _HIGH_TRAFFIC_THRESHOLD,
+                'is_poor_air': pm25 >= _POOR_AIR_PM25_THRESHOLD,
+                'pollution_to_traffic_ratio': self.compute_pollution_to_traffic_ratio()
+            })
+        # Copy so callers can't modify the cache
+        return dict(self._dict)
+
+
+# Fixed small-integer code for each NYC borough/county (-1 is used for anything else)
+BORO_CODE = {"bronx": 0, "brooklyn": 1, "manhattan": 2, "queens": 3, "staten island": 4}
+NYC_COUNTIES = set(BORO_CODE)
+
+# Shared categorical dtype for the location column, so traffic and air frames
+# store int8 codes (matching BORO_CODE) and join on identical categories
+LOCATION_DTYPE = pd.CategoricalDtype(sorted(BORO_CODE, key=BORO_CODE.get))
+
+# Bytes of traffic CSV parsed per streamed block (roughly 300k rows)
+TRAFFIC_BLOCK_SIZE = 32 << 20
+
+# Total size of air quality CSVs above which they are parsed in worker processes
+# rather than threads (below it, pickling the results back costs more than it saves)
+AIR_PROCESS_POOL_MIN_BYTES = 64 << 20
+
+# Skip rows with the wrong number of fields instead of failing the whole file
+SKIP_MALFORMED_ROWS = pacsv.ParseOptions(invalid_row_handler=lambda row: 'skip')
+
+# Numeric CSV cells are read as strings and cast afterwards, so a bad cell only
+# loses its own row. These match (trimmed) strings that Arrow can cast.
+_INT_PATTERN = r'^-?\d{1,9}$'
+_FLOAT_PATTERN = r'^-?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+
+
+def _csv_convert_options(name_column: str, value_columns: List[str],
+                         include_missing_columns: bool = False) -> pacsv.ConvertOptions:
+    """
+    Read name_column dictionary-encoded and value_columns as strings, skipping all other columns.
+
+    With include_missing_columns, columns the file doesn't have are read as all
+    nulls; otherwise they make the read fail with ArrowKeyError.
+    """
+    return pacsv.ConvertOptions(
+        include_columns=[name_column] + value_columns,
+        include_missing_columns=include_missing_columns,
+        column_types={name_column: pa.dictionary(pa.int32(), pa.string()),
+                      **dict.fromkeys(value_columns, pa.string())},
+        # The government CSVs are plain ASCII, so skip UTF-8 validation of string columns
+        check_utf8=False,
+    )
+
+
+# Columns read from the traffic CSV and from each air quality CSV. Older traffic
+# exports name the volume column 'Volume', so either one may be missing.
+TRAFFIC_CONVERT_OPTIONS = _csv_convert_options('Boro', ['Yr', 'M', 'D', 'Vol', 'Volume'],
+                                               include_missing_columns=True)
+AIR_CONVERT_OPTIONS = _csv_convert_options('County', ['Date', 'Daily Mean PM2.5 Concentration'])
+
+
+def _date_key(year, month, day) -> np.ndarray:
+    """Encode a date (or arrays of dates) as an int32 YYYYMMDD key."""
+    return (np.asarray(year, np.int32) * 10000 + np.asarray(month, np.int32) * 100
+            + np.asarray(day, np.int32))
+
+
+def _date_str(key: int) -> Optional[str]:
+    """Format a YYYYMMDD date key as YYYY-MM-DD (None for the unknown key 0)."""
+    if not key:
+        return None
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+
+def _parse_date_key(date: Optional[str]) -> int:
+    """
+    Encode a YYYY-MM-DD date string (zero padding optional) as a YYYYMMDD key.
+
+    Args:
+        date: Date string, or None / '' for an unknown date
+
+    Returns:
+        The date key, 0 for an unknown date
+
+    Raises:
+        ValueError: If date is not a valid YYYY-MM-DD date
+    """
+    if not date:
+        return 0
+    try:
+        parsed = datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Invalid date {date!r}, expected YYYY-MM-DD") from None
+    return parsed.year * 10000 + parsed.month * 100 + parsed.day
+
+
+def _join_key(location: pd.Series, date_key: pd.Series) -> np.ndarray:
+    """Combine location codes and YYYYMMDD date keys into one int64 key per row."""
+    return location.cat.codes.to_numpy(np.int64) * 100_000_000 + date_key.to_numpy(np.int64)
+
+
+def _to_number(column, pattern: str, type_: pa.DataType):
+    """
+    Cast a string column to a numeric type, turning values that don't parse into nulls.
+
+    Args:
+        column: Arrow string Array or ChunkedArray
+        pattern: Regex matching the trimmed strings that cast to type_
+        type_: Numeric Arrow type to cast to
+
+    Returns:
+        Column of type_, null where the value was missing or malformed
+    """
+    try:
+        # Fast path: every value in the column is clean
+        return pc.cast(column, type_)
+    except pa.ArrowInvalid:
+        pass
+    # Trim and drop a leading '+', which int()/float() accept but the Arrow cast doesn't
+    column = pc.replace_substring_regex(pc.utf8_trim_whitespace(column), r'^\+', '')
+    return pc.cast(pc.if_else(pc.match_substring_regex(column, pattern), column, None), type_)
+
+
+def _to_volume(column):
+    """
+    Cast a traffic volume string column to int32 the way int(float(s.replace(',', ''))) would.
+
+    Accepts values such as "1,234" and "12.0". Values that don't parse, or
+    don't fit in int32, become nulls.
+
+    Args:
+        column: Arrow string Array or ChunkedArray
+
+    Returns:
+        int32 column
+    """
+    try:
+        # Fast path: plain integers
+        return pc.cast(column, pa.int32())
+    except pa.ArrowInvalid:
+        pass
+    volume = pc.trunc(_to_number(pc.replace_substring(column, ',', ''), _FLOAT_PATTERN, pa.float64()))
+    return pc.cast(pc.if_else(pc.less(pc.abs(volume), 2 ** 31), volume, None), pa.int32())
+
+
+def _normalize_locations(raw: pd.Series) -> pd.Series:
+    """
+    Map a categorical column of raw borough/county names onto LOCATION_DTYPE.
+
+    Names are stripped and lowercased once per distinct value rather than once
+    per row, then looked up in BORO_CODE. Non-NYC names and missing values
+    become NaN (code -1), so callers can filter with an integer compare.
+
+    Args:
+        raw: Categorical Series of names as they appear in the CSV
+
+    Returns:
+        Series with LOCATION_DTYPE, aligned with raw
+    """
+    names = raw.cat.categories.str.strip().str.lower()
+    # Extra trailing -1 so the missing-value code (-1) also maps to -1
+    lookup = np.array([BORO_CODE.get(name, -1) for name in names] + [-1], dtype=np.int8)
+    codes = lookup[raw.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=LOCATION_DTYPE), index=raw.index)
+
+
+def _traffic_block_to_pandas(block) -> pd.DataFrame:
+    """
+    Convert one block of the traffic CSV, with its numbers still as strings, to pandas.
+
+    Yr, M, D and Vol are cast to int32 (Vol may have thousands separators or a
+    decimal part; a file without a Vol column uses Volume). Rows where any of
+    them is missing or malformed are dropped.
+
+    Args:
+        block: Arrow RecordBatch or Table with 'Boro', 'Yr', 'M', 'D', 'Vol' and 'Volume' columns
+
+    Returns:
+        DataFrame with 'Boro', 'Yr', 'M', 'D' and 'Vol' columns
+    """
+    table = pa.table({'Boro': block.column('Boro'),
+                      **{name: _to_number(block.column(name), _INT_PATTERN, pa.int32())
+                         for name in ('Yr', 'M', 'D')},
+                      # A missing Vol column is all nulls, so this falls back to Volume
+                      'Vol': _to_volume(pc.coalesce(block.column('Vol'), block.column('Volume')))})
+    return table.drop_null().to_pandas()
+
+
+def _filter_traffic_block(block: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep the NYC rows with traffic from one block of the traffic CSV.
+
+    Args:
+        block: DataFrame with 'Boro' (categorical), 'Yr', 'M', 'D' and 'Vol' columns
+
+    Returns:
+        DataFrame with 'location', 'Yr', 'M', 'D' and 'Vol' columns
+    """
+    block = block.assign(location=_normalize_locations(block['Boro']))
+    return block.loc[(block['location'].cat.codes >= 0) & (block['Vol'] > 0), ['location', 'Yr', 'M', 'D', 'Vol']]
+
+
+def _empty_air_frame() -> pd.DataFrame:
+    """Return an air quality frame with no rows and the columns _read_one_air_csv produces."""
+    return pd.DataFrame({'location': pd.Series([], dtype=LOCATION_DTYPE),
+                         'date': pd.Series([], dtype='int32'),
+                         'pm25': pd.Series([], dtype='float64')})
+
+
+def _read_one_air_csv(air_file: str) -> pd.DataFrame:
+    """
+    Read one air quality CSV and keep only NYC rows with PM2.5 data.
+
+    Args:
+        air_file: Path to an ad_viz_plotval_data CSV file
+
+    Returns:
+        DataFrame with 'location', 'date' (int YYYYMMDD) and 'pm25' columns
+    """
+    try:
+        table = pacsv.read_csv(air_file, parse_options=SKIP_MALFORMED_ROWS,
+                               convert_options=AIR_CONVERT_OPTIONS)
+    except pa.ArrowException as e:
+        # Unreadable file or missing column: skip this file only
+        print(f"Error reading air file {air_file}: {e}")
+        return _empty_air_frame()
+    # Unparseable PM2.5 values become nulls and are dropped below with the bad dates
+    pm25_index = table.schema.get_field_index('Daily Mean PM2.5 Concentration')
+    table = table.set_column(pm25_index, 'Daily Mean PM2.5 Concentration',
+                             _to_number(table.column(pm25_index), _FLOAT_PATTERN, pa.float64()))
+    air_df = table.to_pandas()
+    air_df = air_df.rename(columns={'Daily Mean PM2.5 Concentration': 'pm25'})
+    air_df = air_df.assign(location=_normalize_locations(air_df['County']))
+    # skip non-NYC counties and rows with no PM2.5 data
+    air_df = air_df[(air_df['location'].cat.codes >= 0) & (air_df['pm25'] != 0)]
+    # parse date MM/DD/YYYY → YYYYMMDD
+    dates = pd.to_datetime(air_df['Date'], format='%m/%d/%Y', errors='coerce')
+    valid = dates.notna() & air_df['pm25'].notna()
+    air_df, dates = air_df[valid], dates[valid]
+    air_df = air_df.assign(date=_date_key(dates.dt.year, dates.dt.month, dates.dt.day))
+    return air_df[['location', 'date', 'pm25']]
+
+
+def _read_air_csvs(air_files: List[str]) -> List[pd.DataFrame]:
+    """
+    Read several air quality CSVs in parallel with _read_one_air_csv.
+
+    PyArrow releases the GIL while parsing, but the pandas clean-up after it
+    does not, so large inputs are spread over a process pool. Small inputs, or
+    a process pool that can't start, use a thread pool instead.
+
+    Args:
+        air_files: Paths to ad_viz_plotval_data CSV files
+
+    Returns:
+        One DataFrame per file, in the same order as air_files
+    """
+    if len(air_files) > 1 and sum(map(os.path.getsize, air_files)) >= AIR_PROCESS_POOL_MIN_BYTES:
+        try:
+            # Spawn fresh workers: forking would copy the parent's Arrow/Numba thread pools
+            with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as ex:
+                return list(ex.map(_read_one_air_csv, air_files))
+        except (BrokenProcessPool, OSError) as e:
+            print(f"Process pool failed ({e}), reading air files with threads")
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        return list(ex.map(_read_one_air_csv, air_files))
 
 
 class CityDataSet:
     """
-    Manages a collection of CityRecord objects for a specific city.
-    
+    Manages the traffic and air quality records for a specific city.
+
+    Records are stored column-wise as parallel NumPy arrays (one entry per
+    record) so the analytics methods can run as vectorized reductions.
+    CityRecord objects are only built on demand.
+
+    The arrays are private, over-allocated buffers that grow geometrically
+    when records are appended; the public column attributes are read-only
+    views of the filled part.
+
     Attributes:
         city_name: Name of the city
-        records: List of CityRecord objects
+        locations: Location names, indexed by location id
+        location_ids: Location id of each record (int32)
+        traffic: Traffic volume of each record (int32)
+        pm25: PM2.5 reading of each record (float64, so every record, mean and
+            ratio sees exactly the value that was read or added)
+        year: Year of each record (int16, 0 if the date is unknown)
+        date_keys: Date of each record as int32 YYYYMMDD (0 if unknown)
     """
     
     def __init__(self, city_name: str) -> None:
@@ -107,8 +411,157 @@ class CityDataSet:
             city_name: Name of the city (e.g., "New York City")
         """
         self.city_name = city_name
-        self.records: List[CityRecord] = []
-    
+        self._clear()
+
+    def _clear(self) -> None:
+        """Remove all records and locations."""
+        self.locations: List[str] = []
+        # Location name -> id (its index in self.locations)
+        self._location_index: Dict[str, int] = {}
+        self._set_columns(np.empty(0, np.int32), np.empty(0, np.int32), np.empty(0, np.float64),
+                          np.empty(0, np.int16), np.empty(0, np.int32))
+
+    def _view(self, buffer: np.ndarray) -> np.ndarray:
+        """Return a read-only view of the filled part of a column buffer."""
+        # Read-only so outside writes can't bypass _clear_derived() and leave caches stale
+        view = buffer[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def location_ids(self) -> np.ndarray:
+        """Location id of each record."""
+        return self._view(self._location_ids)
+
+    @property
+    def traffic(self) -> np.ndarray:
+        """Traffic volume of each record."""
+        return self._view(self._traffic)
+
+    @property
+    def pm25(self) -> np.ndarray:
+        """PM2.5 reading of each record."""
+        return self._view(self._pm25)
+
+    @property
+    def year(self) -> np.ndarray:
+        """Year of each record (0 if the date is unknown)."""
+        return self._view(self._year)
+
+    @property
+    def date_keys(self) -> np.ndarray:
+        """YYYYMMDD date key of each record (0 if unknown)."""
+        return self._view(self._date_keys)
+
+    @property
+    def records(self) -> Tuple[CityRecord, ...]:
+        """
+        Build CityRecord objects for every record in the dataset.
+
+        The tuple is a read-only snapshot; use add_records() to add new records.
+        """
+        return tuple(self._record(i) for i in range(self._size))
+
+    def _record(self, i: int) -> CityRecord:
+        """Build a CityRecord for the record at index i."""
+        return CityRecord(self.locations[self._location_ids[i]], int(self._traffic[i]),
+                          float(self._pm25[i]), _date_str(int(self._date_keys[i])))
+
+    def _location_id(self, location: str) -> int:
+        """Return the id for a location name, registering it if it is new."""
+        location_id = self._location_index.get(location)
+        if location_id is None:
+            location_id = self._location_index[location] = len(self.locations)
+            self.locations.append(location)
+        return location_id
+
+    def _set_columns(self, location_ids: np.ndarray, traffic: np.ndarray, pm25: np.ndarray,
+                     year: np.ndarray, date_keys: np.ndarray) -> None:
+        """Replace all records with the given (already typed) columns."""
+        self._location_ids = location_ids
+        self._traffic = traffic
+        self._pm25 = pm25
+        self._year = year
+        self._date_keys = date_keys
+        self._size = traffic.size
+        self._clear_derived()
+        self._sorted_by_location = bool(np.all(location_ids[1:] >= location_ids[:-1]))
+
+    def _clear_derived(self) -> None:
+        """Drop the cached columns derived from the records; call after any change to them."""
+        self._high_traffic_mask: Optional[np.ndarray] = None
+        self._poor_air_mask: Optional[np.ndarray] = None
+
+    def _ensure_masks(self) -> None:
+        """Compute the high traffic and poor air masks if they aren't cached yet."""
+        if self._high_traffic_mask is None:
+            self._high_traffic_mask = self.traffic >= _HIGH_TRAFFIC_THRESHOLD
+            self._poor_air_mask = self.pm25 >= _POOR_AIR_PM25_THRESHOLD
+
+    def _reserve(self, capacity: int) -> None:
+        """Make sure the buffers can hold capacity records, at least doubling when they grow."""
+        if capacity <= self._traffic.size:
+            return
+        capacity = max(capacity, 2 * self._traffic.size)
+        for name in ('_location_ids', '_traffic', '_pm25', '_year', '_date_keys'):
+            old = getattr(self, name)
+            new = np.empty(capacity, old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def append_bulk(self, locations: List[str], traffic: List[int], pm25: List[float],
+                    dates: Optional[List[Optional[str]]] = None) -> None:
+        """
+        Append records given as parallel sequences.
+
+        Args:
+            locations: Location name of each record
+            traffic: Traffic volume of each record
+            pm25: PM2.5 reading of each record
+            dates: Optional date string (YYYY-MM-DD or None) of each record
+
+        Raises:
+            ValueError: If the sequences differ in length or a value can't be
+                converted; nothing is appended then
+        """
+        n = len(traffic)
+        if dates is None:
+            dates = [None] * n
+        if not len(locations) == len(pm25) == len(dates) == n:
+            raise ValueError(f"append_bulk needs sequences of equal length, got {len(locations)} locations, "
+                             f"{n} traffic, {len(pm25)} pm25 and {len(dates)} dates")
+        # Convert everything before touching any state, so a bad value appends nothing
+        date_keys = np.array([_parse_date_key(d) for d in dates], dtype=np.int32)
+        traffic = np.asarray(traffic, dtype=np.int32)
+        pm25 = np.asarray(pm25, dtype=np.float64)
+
+        self._reserve(self._size + n)
+        new = slice(self._size, self._size + n)
+        self._location_ids[new] = [self._location_id(location) for location in locations]
+        if self._sorted_by_location:
+            # Still sorted if the new ids are sorted and don't step back from the last old one
+            ids = self._location_ids[max(self._size - 1, 0):self._size + n]
+            self._sorted_by_location = bool(np.all(ids[1:] >= ids[:-1]))
+        self._traffic[new] = traffic
+        self._pm25[new] = pm25
+        self._year[new] = date_keys // 10000
+        self._date_keys[new] = date_keys
+        self._size += n
+        self._clear_derived()
+
+    def add_records(self, records: List[CityRecord]) -> None:
+        """
+        Append CityRecord objects to the dataset.
+
+        Args:
+            records: Records to add
+        """
+        # map(attrgetter(...)) pulls each field out without a Python-level loop body
+        self.append_bulk(list(map(attrgetter('location'), records)),
+                         list(map(attrgetter('traffic_volume'), records)),
+                         list(map(attrgetter('pm25'), records)),
+                         list(map(attrgetter('date'), records)))
+
     def average_traffic(self) -> float:
         """
         Calculate the average traffic volume across all records.
@@ -116,11 +569,10 @@ class CityDataSet:
         Returns:
             Average traffic volume (float). Returns 0.0 if no records exist.
         """
-        if not self.records:
+        if not self.traffic.size:
             return 0.0
         
-        total_traffic = sum(record.traffic_volume for record in self.records)
-        return total_traffic / len(self.records)
+        return _kernels.mean(self.traffic)
     
     def average_air_quality(self) -> Dict[str, float]:
         """
@@ -130,14 +582,11 @@ class CityDataSet:
             Dictionary with 'pm25' key containing average value.
             Returns {'pm25': 0.0} if no records exist.
         """
-        if not self.records:
+        if not self.pm25.size:
             return {'pm25': 0.0}
         
-        total_pm25 = sum(record.pm25 for record in self.records)
-        num_records = len(self.records)
-        
         return {
-            'pm25': total_pm25 / num_records
+            'pm25': _kernels.mean(self.pm25)
         }
 
         # Load Data:
@@ -146,31 +595,30 @@ class CityDataSet:
         # Load traffic and air quality CSV files, merge them, and create CityRecord objects.
         # Input, Output:
         # Input: traffic_file (str), air_folder (str)
-        # Output: None (populates self.records with CityRecord objects)
+        # Output: None (populates the dataset's NumPy columns)
         # Identify the representation of the data:
         # Traffic CSV: 'Boro', 'Yr', 'M', 'D', 'Vol'
         # Air CSVs: 'County', 'Date', 'Daily Mean PM2.5 Concentration'
-        # Each CityRecord: location (str), traffic_volume (int), pm25 (float), date (str)
+        # Columns: location id (int32), traffic (int32), pm25 (float64), year (int16), date key (int32)
         # Name and template the function:
         # def load_data(self, traffic_file: str, air_folder: str = "data/AirQuality")
         # Hand Test:
         # Traffic CSV row: {'Boro': 'Bronx', 'Yr': 2016, 'M': 5, 'D': 8, 'Vol': 356}
         # Air CSV row: {'County': 'Bronx', 'Date': '05/08/2016', 'Daily Mean PM2.5 Concentration': 12.5}
-        # Expected: self.records contains CityRecord(location='bronx', traffic_volume=356, pm25=12.5, date='2016-05-08')
+        # Expected: one record equal to CityRecord(location='bronx', traffic_volume=356, pm25=12.5, date='2016-05-08')
         # Implementation steps:
-        # 1. Initialize empty index dictionary keyed by (location.lower(), date).
-        # 2. Read traffic CSV row by row:
-        #    - Skip non-NYC counties.
-        #    - Parse date as YYYY-MM-DD.
-        #    - Parse traffic volume as int.
-        #    - Create CityRecord with pm25=0 and add to index.
-        # 3. Read all air quality CSVs:
-        #    - Skip non-NYC counties.
-        #    - Parse date MM/DD/YYYY → YYYY-MM-DD.
-        #    - Parse PM2.5 value as float.
-        #    - Update corresponding CityRecord in index.
-        # 4. Keep only records with traffic_volume > 0 and pm25 > 0.
-        # 5. Assign list of valid records to self.records.
+        # 1. Stream traffic CSV in blocks with PyArrow (only the needed columns, typed):
+        #    - Read boroughs dictionary-encoded, lowercase each distinct name once,
+        #      skip non-NYC counties, store as category.
+        #    - Skip rows with no traffic volume.
+        #    - Build an int32 date key YYYYMMDD from Yr/M/D (no string formatting).
+        # 2. Read all air quality CSVs with PyArrow, in parallel threads:
+        #    - Skip non-NYC counties and rows with no PM2.5 data (pm25 as float64).
+        #    - Parse date MM/DD/YYYY → YYYYMMDD key.
+        # 3. Encode (location, date) as one int64 key and keep the last row per key on each side.
+        # 4. Keep only air rows with pm25 > 0 (traffic is already > 0).
+        # 5. Join traffic and air data on the key: probe a hash index of the air keys.
+        # 6. Store the merged columns as NumPy arrays (no CityRecord objects).
 
     def load_data(self, traffic_file: str, air_folder: str = "data/AirQuality"):
         """
@@ -178,77 +626,82 @@ class CityDataSet:
         Only keep rows where both traffic and PM2.5 exist (>0).
         Merge PM2.5 from air quality files by county/date.
         """
-        import os
-        import csv
-
-        index = {}  # key = (county.lower(), date_str)
-        NYC_COUNTIES = {"bronx", "brooklyn", "manhattan", "queens", "staten island"}
-
         # ---- Load traffic data ----
-        with open(traffic_file, newline='', encoding='utf-8') as fh:
-            reader = csv.DictReader(fh)
-            for row in reader:
-                boro = row.get("Boro", "").strip().lower()
-                if boro not in NYC_COUNTIES:
-                    continue
-
-                try:
-                    year = int(row.get('Yr', 0))
-                    month = int(row.get('M', 0))
-                    day = int(row.get('D', 0))
-                    date_str = f"{year:04d}-{month:02d}-{day:02d}"
-                except Exception:
-                    continue
-
-                traffic_str = row.get('Vol', row.get('Volume', '0')).replace(',', '')
-                try:
-                    traffic = int(float(traffic_str))
-                except Exception:
-                    traffic = 0
-
-                if traffic == 0:
-                    continue  # skip traffic rows with no data
-
-                location = boro
-                key = (location, date_str)
-                index[key] = CityRecord(location, traffic, 0.0, date_str)
+        # Stream the file in blocks and filter each one as it arrives, so only the
+        # (much smaller) NYC subset is ever held in memory
+        try:
+            reader = pacsv.open_csv(
+                traffic_file,
+                read_options=pacsv.ReadOptions(block_size=TRAFFIC_BLOCK_SIZE),
+                parse_options=SKIP_MALFORMED_ROWS,
+                convert_options=TRAFFIC_CONVERT_OPTIONS,
+            )
+        except pa.ArrowException as e:
+            # Like a successful load, this replaces whatever the dataset held before
+            print(f"Error reading traffic file: {e}")
+            self._clear()
+            return
+        blocks = []
+        try:
+            for batch in reader:
+                blocks.append(_filter_traffic_block(_traffic_block_to_pandas(batch)))
+        except pa.ArrowException as e:
+            # Keep the blocks parsed before the error instead of dropping the whole file
+            print(f"Error reading traffic file, keeping the rows read before it: {e}")
+        if blocks:
+            traffic_df = pd.concat(blocks, ignore_index=True)
+        else:
+            traffic_df = _filter_traffic_block(_traffic_block_to_pandas(reader.schema.empty_table()))
+        # Skip rows whose Yr/M/D is not a real calendar date
+        valid = pd.to_datetime(
+            traffic_df[['Yr', 'M', 'D']].rename(columns={'Yr': 'year', 'M': 'month', 'D': 'day'}),
+            errors='coerce',
+        ).notna()
+        traffic_df = traffic_df[valid]
+        traffic_df = traffic_df.assign(date=_date_key(traffic_df['Yr'], traffic_df['M'], traffic_df['D']),
+                                       traffic_volume=traffic_df['Vol'])
+        traffic_df = traffic_df[['location', 'date', 'Yr', 'traffic_volume']]
 
         # ---- Load air quality CSVs ----
-        if os.path.exists(air_folder):
-            air_files = [os.path.join(air_folder, f)
-                         for f in os.listdir(air_folder)
-                         if f.startswith("ad_viz_plotval_data (") and f.endswith(".csv")]
+        # Sorted so that duplicate (county, date) rows resolve the same way every run
+        air_files = sorted(glob.glob(os.path.join(glob.escape(air_folder), "ad_viz_plotval_data (*).csv")))
+        # Each file is independent, so read them in parallel
+        air_frames = _read_air_csvs(air_files)
 
-            for air_file in air_files:
-                with open(air_file, newline='', encoding='utf-8') as fh:
-                    reader = csv.DictReader(fh)
-                    for row in reader:
-                        try:
-                            # parse date MM/DD/YYYY → YYYY-MM-DD
-                            m, d, y = row['Date'].split('/')
-                            date_str = f"{int(y):04d}-{int(m):02d}-{int(d):02d}"
+        if air_frames:
+            air_df = pd.concat(air_frames, ignore_index=True)
+        else:
+            air_df = _empty_air_frame()
 
-                            location = row.get('County', '').strip().lower()
-                            if location not in NYC_COUNTIES:
-                                continue
+        # ---- Encode (county, date) as one int64 join key per row ----
+        traffic_df = traffic_df.assign(key=_join_key(traffic_df['location'], traffic_df['date']))
+        air_df = air_df.assign(key=_join_key(air_df['location'], air_df['date']))
 
-                            pm25 = float(row.get('Daily Mean PM2.5 Concentration', 0.0))
-                            if pm25 == 0:
-                                continue  # skip rows with no PM2.5 data
-
-                            key = (location, date_str)
-                            if key in index:
-                                index[key].pm25 = pm25
-
-
-                        except Exception:
-                            continue  # skip invalid rows
+        # ---- Keep the last row per (county, date) on each side ----
+        traffic_df = traffic_df.drop_duplicates(subset='key', keep='last')
+        air_df = air_df.drop_duplicates(subset='key', keep='last')
 
         # ---- Keep only records where both traffic and PM2.5 are >0 ----
-        self.records = [record for record in index.values()
-                        if record.traffic_volume > 0 and record.pm25 > 0]
-
-        print(f"Loaded {len(self.records)} valid records for NYC counties with traffic and PM2.5.")
+        # Traffic rows with no volume were already dropped while reading; filtering
+        # PM2.5 here means the join only sees rows that can survive it.
+        air_df = air_df[air_df['pm25'] > 0]
+
+        # ---- Hash join traffic and PM2.5 by (county, date) ----
+        # The air keys are unique, so a hash index over them finds every traffic
+        # key's air row (-1 if there is none) in one vectorized probe
+        pos = pd.Index(air_df['key'].to_numpy()).get_indexer(traffic_df['key'].to_numpy())
+        matched = pos >= 0
+        merged = traffic_df[matched]
+
+        self.locations = list(LOCATION_DTYPE.categories)
+        self._location_index = {name: i for i, name in enumerate(self.locations)}
+        self._set_columns(merged['location'].cat.codes.to_numpy(np.int32),
+                          merged['traffic_volume'].to_numpy(np.int32),
+                          air_df['pm25'].to_numpy(np.float64)[pos[matched]],
+                          merged['Yr'].to_numpy(np.int16),
+                          merged['date'].to_numpy(np.int32))
+
+        print(f"Loaded {self.traffic.size} valid records for NYC counties with traffic and PM2.5.")
         # Find HostSpot:
 
         # Purpose:
@@ -257,8 +710,8 @@ class CityDataSet:
         # Input: threshold (float)
         # Output: List[CityRecord] where pollution-to-traffic ratio > threshold
         # Identify the representation of the data:
-        # Each CityRecord has traffic_volume and pm25 attributes.
-        # Ratio = pm25 / traffic_volume
+        # self.traffic and self.pm25 are parallel NumPy arrays.
+        # Ratio = pm25 / traffic
         # Name and template the function:
         # def find_hotspots(self, threshold: float) -> List[CityRecord]
         # Hand Test:
@@ -268,12 +721,12 @@ class CityDataSet:
         # Threshold: 0.01
         # Expected output: [CityRecord(location='A', ...)]
         # Implementation steps:
-        # 1. Initialize empty list `hotspots`.
-        # 2. Iterate through self.records:
-        #    - Skip if traffic_volume <= 0 or pm25 <= 0.
-        #    - Compute ratio = record.pm25 / record.traffic_volume.
-        #    - If ratio > threshold, append record to hotspots.
-        # 3. Return hotspots list (empty if none meet threshold).
+        # 1. Build a boolean mask over all records with a Numba kernel (NumPy without Numba):
+        #    - Skip if traffic <= 0 or pm25 <= 0.
+        #    - Keep if pm25 / traffic > threshold, divided in float64 (equal ratios are not hotspots).
+        # 2. find_hotspot_indices returns the matching indices.
+        # 3. Build CityRecord objects only for those indices and return them
+        #    (empty list if none meet threshold).
 
     def find_hotspots(self, threshold: float) -> List[CityRecord]:
         """
@@ -287,14 +740,30 @@ class CityDataSet:
         Returns:
             List of CityRecord objects that exceed the threshold
         """
-        hotspots = []
-        for record in self.records:
-            # Skip records with zero traffic or zero PM2.5 to avoid invalid ratios
-            if record.traffic_volume > 0 and record.pm25 > 0:
-                ratio = record.compute_pollution_to_traffic_ratio()
-                if ratio > threshold:
-                    hotspots.append(record)
-        return hotspots
+        return [self._record(i) for i in self.find_hotspot_indices(threshold).tolist()]
+
+    def find_hotspot_indices(self, threshold: float) -> np.ndarray:
+        """
+        Find the records whose pollution-to-traffic ratio is above threshold.
+
+        Unlike find_hotspots, no CityRecord objects are built; index the column
+        attributes with the result to read the matching records.
+
+        Args:
+            threshold: Minimum pollution-to-traffic ratio to be considered a hotspot
+
+        Returns:
+            Ascending array of record indices
+        """
+        # Records with zero traffic or zero PM2.5 are skipped by the kernel
+        return np.flatnonzero(_kernels.hotspot_mask(self.traffic, self.pm25, threshold))
+
+    def _ratios_at(self, indices: np.ndarray) -> np.ndarray:
+        """Return the pollution-to-traffic ratios of the records at indices (0.0 for zero traffic)."""
+        traffic = self.traffic[indices]
+        nonzero = traffic != 0
+        # Branchless: divide by 1 where traffic is 0, then zero those results
+        return self.pm25[indices] / (traffic | ~nonzero) * nonzero
 
         # Purpose:
         # Generate a formatted report of traffic and air quality statistics and write to a file.
@@ -302,7 +771,7 @@ class CityDataSet:
         # Input: output_file (str)
         # Output: None (writes report to file)
         # Identify the representation of the data:
-        # - self.records: list of CityRecord objects
+        # - self.traffic, self.pm25, self.year: parallel NumPy arrays
         # - Compute statistics using helper methods:
         #   - self.average_traffic() → float
         #   - self.average_air_quality() → dict with 'pm25'
@@ -321,45 +790,48 @@ class CityDataSet:
         #   - Poor Air Quality Locations: count
         #   - Hotspots: list of locations exceeding threshold
         # Implementation steps:
-        # 1. Compute total_records = len(self.records).
-        # 2. Compute avg_traffic = self.average_traffic().
-        # 3. Compute avg_air = self.average_air_quality().
-        # 4. Count high_traffic_count = number of records with traffic_volume >= threshold.
-        # 5. Count poor_air_count = number of records with pm25 >= threshold.
-        # 6. Compute hotspots using self.find_hotspots(threshold=0.01).
-        # 7. Format report as multi-line string using f-strings.
-        # 8. Write report to output_file using with open(..., 'w').
-        # 9. Handle exceptions in file writing and print error if occurs.
+        # 1. Compute total_records = self.traffic.size.
+        # 2. In one pass over the columns (Numba kernel, NumPy without Numba), accumulate total traffic,
+        #    total pm25, per-year sums/counts, and the hotspot mask.
+        # 3. Compute avg_traffic and avg_air from the totals.
+        # 4. Compute yearly averages from the per-year sums and counts.
+        #    Group by location (np.bincount over location ids) for per-location
+        #    averages and the high traffic / poor air counts.
+        # 5. Read hotspot locations and ratios from the columns at the hotspot mask indices.
+        # 6. Format report header and yearly lines using f-strings.
+        # 7. Write them, then each hotspot, to output_file through a 64 KiB buffer.
+        # 8. Handle exceptions in file writing and print error if occurs.
 
     def export_summary(self, output_file: str) -> None:
         """
         Export a summary report including overall and yearly averages of traffic and PM2.5.
         """
         try:
-            if not self.records:
+            if not self.traffic.size:
                 print("No records to summarize.")
                 return
 
+            # One pass over the columns: totals, yearly sums and hotspot flags
+            # (records without a date have year 0 and are left out of the yearly sums)
+            dated_years = self.year[self.year > 0]
+            first_year = int(dated_years.min()) if dated_years.size else 0
+            n_years = int(dated_years.max()) - first_year + 1 if dated_years.size else 0
+            hotspot_threshold = 0.5
+            total_t, total_p, sum_t, sum_p, counts, hotspot_mask = _kernels.summary_stats(
+                self.year, first_year, n_years, self.traffic, self.pm25, hotspot_threshold)
+
             # Overall averages
-            overall_avg_traffic = self.average_traffic()
-            overall_avg_air = self.average_air_quality()['pm25'] # Makes it easier to add other air data sets for different gasses
-
-            # Aggregate yearly data
-            yearly_data: Dict[int, Dict[str, List[float]]] = {}
-            for record in self.records:
-                year = int(record.date[:4])  # YYYY-MM-DD → YYYY
-                if year not in yearly_data:
-                    yearly_data[year] = {'traffic': [], 'pm25': []}
-                yearly_data[year]['traffic'].append(record.traffic_volume)
-                yearly_data[year]['pm25'].append(record.pm25)
+            overall_avg_traffic = total_t / self.traffic.size
+            overall_avg_air = total_p / self.pm25.size
+
+            present = counts > 0
+            years = np.flatnonzero(present) + first_year
+            yearly_traffic = sum_t[present] / counts[present]
+            yearly_pm25 = sum_p[present] / counts[present]
 
             # Compute yearly averages
             yearly_avg_lines = []
-            for year in sorted(yearly_data.keys()):
-                traffic_list = yearly_data[year]['traffic']
-                pm25_list = yearly_data[year]['pm25']
-                avg_traffic = sum(traffic_list) / len(traffic_list)
-                avg_pm25 = sum(pm25_list) / len(pm25_list)
+            for year, avg_traffic, avg_pm25 in zip(years.tolist(), yearly_traffic.tolist(), yearly_pm25.tolist()):
                 traffic_diff = avg_traffic - overall_avg_traffic
                 pm25_diff = avg_pm25 - overall_avg_air
                 yearly_avg_lines.append(
@@ -369,35 +841,103 @@ class CityDataSet:
                     f"(Diff {pm25_diff:+.2f})"
                 )
 
-            # Hotspots
-            hotspot_threshold = 0.5
-            hotspots = self.find_hotspots(threshold=hotspot_threshold)
-            hotspot_locations = [f"{r.location} - Ratio: {r.compute_pollution_to_traffic_ratio():.6f}"
-                                 for r in hotspots]
+            # Per-location group-by: one bincount pass per aggregate over the location ids
+            loc_counts, loc_traffic, loc_pm25, loc_high, loc_poor = self._location_stats()
+            location_lines = []
+            for i in np.flatnonzero(loc_counts).tolist():
+                location_lines.append(
+                    f"{self.locations[i]}: Records = {loc_counts[i]}, "
+                    f"Avg Traffic = {loc_traffic[i] / loc_counts[i]:.2f}, "
+                    f"Avg PM2.5 = {loc_pm25[i] / loc_counts[i]:.2f}, "
+                    f"High Traffic = {loc_high[i]}, Poor Air = {loc_poor[i]}"
+                )
+
+            # Hotspots are read straight from the columns; no CityRecord is built
+            hotspot_idx = np.flatnonzero(hotspot_mask)
+            hotspot_locations = self.location_ids[hotspot_idx].tolist()
+            hotspot_ratios = self._ratios_at(hotspot_idx).tolist()
 
-            # Prepare report string
-            report = (
+            # Prepare report header
+            header = (
                 "========================================\n"
                 "UrbanFlow Analysis Report\n"
                 "========================================\n"
                 f"City: {self.city_name}\n"
-                f"Total Records: {len(self.records)}\n"
+                f"Total Records: {self.traffic.size}\n"
                 f"Overall Average Traffic: {overall_avg_traffic:.2f} vehicles/hour\n"
-                f"Overall Average PM2.5: {overall_avg_air:.2f} µg/m³\n\n"
-                "Yearly Averages and Differences:\n"
+                f"Overall Average PM2.5: {overall_avg_air:.2f} µg/m³\n"
+                f"High Traffic Locations: {int(loc_high.sum())}\n"
+                f"Poor Air Quality Locations: {int(loc_poor.sum())}\n\n"
+                "Location Averages:\n"
             )
-            report += "\n".join(yearly_avg_lines)
-            report += "\n\nHotspots:\n" + ", ".join(hotspot_locations) + "\n"
 
-            # Write to file
-            with open(output_file, 'w') as f:
+            # Everything before the hotspots is small, so it goes out in one write
+            report = "".join([
+                header,
+                "\n".join(location_lines),
+                "\n\nYearly Averages and Differences:\n",
+                "\n".join(yearly_avg_lines),
+                "\n\nHotspots:\n",
+            ])
+            locations = self.locations
+            hotspot_parts = (
+                f"{', ' if n else ''}{locations[loc]} - Ratio: {ratio:.6f}"
+                for n, (loc, ratio) in enumerate(zip(hotspot_locations, hotspot_ratios))
+            )
+
+            # The hotspot list can be long, so stream it through a 64 KiB buffer with
+            # writelines instead of building one big string
+            with open(output_file, 'w', buffering=1 << 16) as f:
                 f.write(report)
+                f.writelines(hotspot_parts)
+                f.write("\n")
 
             print(f"Summary report successfully written to {output_file}")
 
         except Exception as e:
             print(f"Error writing summary report: {e}")
 
+    def _location_stats(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Aggregate the records by location.
+
+        Location ids are already dense integer codes, so each aggregate is a
+        single np.bincount pass (a hash-free GROUP BY). When the records are
+        sorted by location, the groups are contiguous runs and are summed
+        with np.add.reduceat over the run boundaries instead.
+
+        Returns:
+            Arrays indexed by location id: (record count, traffic sum, PM2.5 sum,
+            high traffic record count, poor air record count)
+        """
+        n_locations = len(self.locations)
+        ids = self.location_ids
+        self._ensure_masks()
+        high_mask = self._high_traffic_mask
+        poor_mask = self._poor_air_mask
+
+        if self._sorted_by_location and ids.size:
+            starts = np.concatenate(([0], np.flatnonzero(ids[1:] != ids[:-1]) + 1))
+            run_ids = ids[starts]
+            counts = np.zeros(n_locations, np.int64)
+            traffic_sums = np.zeros(n_locations)
+            pm25_sums = np.zeros(n_locations)
+            high = np.zeros(n_locations, np.int64)
+            poor = np.zeros(n_locations, np.int64)
+            counts[run_ids] = np.diff(np.append(starts, ids.size))
+            traffic_sums[run_ids] = np.add.reduceat(self.traffic, starts, dtype=np.float64)
+            pm25_sums[run_ids] = np.add.reduceat(self.pm25, starts, dtype=np.float64)
+            high[run_ids] = np.add.reduceat(high_mask, starts, dtype=np.int64)
+            poor[run_ids] = np.add.reduceat(poor_mask, starts, dtype=np.int64)
+            return counts, traffic_sums, pm25_sums, high, poor
+
+        counts = np.bincount(ids, minlength=n_locations)
+        traffic_sums = np.bincount(ids, weights=self.traffic, minlength=n_locations)
+        pm25_sums = np.bincount(ids, weights=self.pm25, minlength=n_locations)
+        high = np.bincount(ids[high_mask], minlength=n_locations)
+        poor = np.bincount(ids[poor_mask], minlength=n_locations)
+        return counts, traffic_sums, pm25_sums, high, poor
+
     # ---- CHRISTOPHER'S TEST CODE BELOW ----
 
 def main():
@@ -428,9 +968,7 @@ def main():
 
     # Create CityDataSet and add records
     nyc_data = CityDataSet("New York City")
-    nyc_data.records.append(record1)
-    nyc_data.records.append(record2)
-    nyc_data.records.append(record3)
+    nyc_data.add_records([record1, record2, record3])
 
     # Print average traffic
     avg_traffic = nyc_data.average_traffic()